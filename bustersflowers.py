@@ -1,5 +1,38 @@
 from maya import cmds
-import math
+import maya.api.OpenMaya as om
+import numpy as np
+import logging
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+@contextmanager
+def _fast_build():
+    """
+    Suspends viewport refresh and parallel evaluation while building scene geometry,
+    recording the whole build as a single undo step and restoring previous state afterwards.
+    """
+    evaluation_mode = cmds.evaluationManager(query=True, mode=True)[0]
+    refresh_suspended = undo_chunk_open = evaluation_changed = False
+
+    try:
+        cmds.refresh(suspend=True)
+        refresh_suspended = True
+
+        cmds.undoInfo(openChunk=True)
+        undo_chunk_open = True
+
+        cmds.evaluationManager(mode='off')
+        evaluation_changed = True
+
+        yield
+    finally:
+        if evaluation_changed:
+            cmds.evaluationManager(mode=evaluation_mode)
+        if undo_chunk_open:
+            cmds.undoInfo(closeChunk=True)
+        if refresh_suspended:
+            cmds.refresh(suspend=False)
 
 class Flower:
     FIBONACCI_LAYER_SETS = [
@@ -7,12 +40,18 @@ class Flower:
         (21, 13, 8), (34, 21, 13), (55, 34, 21)
     ]
 
+    # Layer sets keyed by number of base petals
+    _LAYER_BY_BASE = {layer_set[0]: layer_set for layer_set in FIBONACCI_LAYER_SETS}
+
     PETAL_VERTEX_MOVES = [
         (0.1, 0.13, 0.18), (0.2, 0.15, 0.21),
         (0.4, 0.17, 0.23), (0.6, 0.15, 0.24),
         (0.8, 0.16, 0.18), (1, 0.2, 0)
     ]
 
+    # Vertex moves mirrored across z for right side of petal
+    PETAL_VERTEX_MOVES_R = tuple((x, y, -z) for x, y, z in PETAL_VERTEX_MOVES)
+
     SUNFLOWER = {
         'width': 1, 'height': 0.05, 'depth': 0.2,
         'subdiv-x': 8, 'subdiv-y': 1, 'subdiv-z': 1,
@@ -22,6 +61,13 @@ class Flower:
     # DAISY = {}
     # ASTER = {}
 
+    # Petal instance scale per layer type
+    LAYER_SCALES = {
+        'base': (1, 1, 1),
+        'mid': (0.85, 0.85, 0.85),
+        'inner': (0.7, 0.5, 0.8)
+    }
+
     def __init__(self, flower_type=SUNFLOWER, base_petal_count=21):
         self.flower_type = flower_type
         self.base_petal_count = base_petal_count
@@ -39,29 +85,38 @@ class Flower:
         - flower_disk (str): name of created flower disk object in Maya
         - all_petals (list): list of all arranged petal objects in Maya
         """
-        print("Creating flower with base petal count:", self.base_petal_count)
+        log.debug("Creating flower with base petal count: %d", self.base_petal_count)
 
         # Determine petals per layer 
         petal_base, petal_mid, petal_inner = self._find_layer_set(self.base_petal_count)
-        print("Petal counts for layers - Base:", petal_base, ", Mid:", petal_mid, ", Inner:", petal_inner)
+        log.debug("Petal counts for layers - Base: %d, Mid: %d, Inner: %d", petal_base, petal_mid, petal_inner)
 
-        # Create flower disk based on flower type and number of base petals
-        flower_disk = self._create_disk()
-        print("Created flower disk:", flower_disk)
+        # Suspend redraw and evaluation while building geometry, undoable as one step
+        with _fast_build():
+            # Create flower disk based on flower type and number of base petals
+            flower_disk = self._create_disk()
+            log.debug("Created flower disk: %s", flower_disk)
 
-        # Define layer types and corresponding petal counts
-        layer_types = ['base', 'mid', 'inner']
-        petal_counts = [petal_base, petal_mid, petal_inner]
+            # Define layer types and corresponding petal counts
+            layer_types = ['base', 'mid', 'inner']
+            petal_counts = [petal_base, petal_mid, petal_inner]
 
-        for layer_type, petal_count in zip(layer_types, petal_counts):
-            # Create petal shape based on layer and flower type
-            petal_shape = self._create_petal(layer_type) # layer_type is not currently being used in _create_petal
-            print(f"Created {layer_type} petal shape:", petal_shape)
+            # Create petal shape once, shared by all layers
+            petal_shape = self._create_petal()
+            log.debug("Created petal shape: %s", petal_shape)
 
-            # Arrange petals around disk for current layer type
-            arranged_layer = self._arrange_petals(petal_shape, petal_count, layer_type)
-            print(f"Arranged {layer_type} layer petals:", arranged_layer)
-            self.all_petals.extend(arranged_layer)
+            for layer_type, petal_count in zip(layer_types, petal_counts):
+                # Arrange petals around disk for current layer type
+                arranged_layer = self._arrange_petals(petal_shape, petal_count, layer_type)
+                log.debug("Arranged %s layer petals: %s", layer_type, arranged_layer)
+                self.all_petals.extend(arranged_layer)
+
+            # Delete original petal used for instancing
+            cmds.delete(petal_shape)
+
+            # Clear selection
+            cmds.select(clear=True)
+            log.debug("Deleted original petal used for instancing.")
 
         return flower_disk, self.all_petals
 
@@ -80,12 +135,12 @@ class Flower:
         Raises:
         - ValueError: if no matching layer set is found for the given base petals
         """
-        for layer_set in Flower.FIBONACCI_LAYER_SETS:
-            if layer_set[0] == base_petals:
-                print("Found layer set:", layer_set)
-                return layer_set
-            
-        raise ValueError(f"No matching layer set found for petal count: {base_petals}")
+        layer_set = Flower._LAYER_BY_BASE.get(base_petals)
+        if layer_set is None:
+            raise ValueError(f"No matching layer set found for petal count: {base_petals}")
+
+        log.debug("Found layer set: %s", layer_set)
+        return layer_set
 
     def _create_disk(self):
         """
@@ -98,7 +153,7 @@ class Flower:
         Returns:
         - disk (str): name of the created flower disk object in Maya
         """
-        print("Creating spherical disk")
+        log.debug("Creating spherical disk")
 
         disk = cmds.polySphere(
             radius=self.flower_type['radius'], 
@@ -111,63 +166,123 @@ class Flower:
 
         # Adjust disk position to align with petals
         cmds.move(0, self.flower_type['height'] + 0.08, 0, disk)
-        print("Moved disk to position:", (0, self.flower_type['height'] + 0.08, 0))
+        log.debug("Moved disk to position: %s", (0, self.flower_type['height'] + 0.08, 0))
 
         return disk
 
-    def _create_petal(self, layer_type):
+    def _create_petal(self):
         """
-        Creates petals based on flower_type dimensions and adjusts them based on layer_type.
+        Creates a petal based on flower_type dimensions, shared by all layers.
 
         Parameters:
-        - layer_type (str): type of layer ('base', 'mid', 'inner')
-        - flower_type (dict): dictionary containing dimensions ('width', 'height', 'depth', 'subdiv-x', 'subdiv-y')
+        - flower_type (dict): dictionary containing dimensions ('subdiv-x', 'subdiv-y')
 
         Returns:
         - petal (str): name of the created petal object in Maya
         """
-        print("Creating petal for layer type:", layer_type)
+        # Compute deformed petal vertices and faces based on flower type
+        points = np.empty((self._get_vertex_count(), 3), dtype=np.float64)
+        polygon_counts, polygon_connects, u_values, v_values = self._get_cube_topology()
+        log.debug("Creating petal with %d vertices", len(points))
 
-        # Create shape with dimensions based on flower type
-        petal = cmds.polyCube(
-            w=self.flower_type['width'], h=self.flower_type['height'], d=self.flower_type['depth'], 
-            sx=self.flower_type['subdiv-x'], sy=self.flower_type['subdiv-y'], name='petal'
-        )[0]
+        # Draw petal curvature based on flower type
+        self._move_vertices(points)
 
-        # Save petal vertices to list
-        num_vertices = cmds.polyEvaluate(petal, vertex=True)
-        print("Number of vertices in petal:", num_vertices)
+        # Create deformed petal mesh with UVs in a single API call
+        mesh_fn = om.MFnMesh()
+        mesh_transform = mesh_fn.create(
+            om.MPointArray([om.MPoint(x, y, z) for x, y, z in points.tolist()]),
+            polygon_counts, polygon_connects, u_values, v_values
+        )
+        mesh_fn.assignUVs(polygon_counts, list(range(len(polygon_connects))))
 
-        # Draw petal curvature based on flower type
-        self._move_vertices(petal, num_vertices)
+        # Name petal and its shape as polyCube would
+        node_fn = om.MFnDependencyNode(mesh_transform)
+        node_fn.setName('petal')
+        petal = node_fn.name()
+        om.MFnDependencyNode(mesh_fn.object()).setName(petal + 'Shape')
+
+        # Assign default shader, as meshes created through the API have none
+        cmds.sets(petal, edit=True, forceElement='initialShadingGroup')
 
         return petal
 
-    def _move_vertices(self, petal, num_vertices):
+    def _get_vertex_count(self):
+        """
+        Computes number of vertices in a subdivided cube based on flower_type subdivisions.
+
+        Returns:
+        - num_vertices (int): (subdiv-x + 1) vertices per row, (subdiv-y + 1) rows on each of front and back
+        """
+        return (self.flower_type['subdiv-x'] + 1) * 2 * (self.flower_type['subdiv-y'] + 1)
+
+    def _get_cube_topology(self):
+        """
+        Computes faces of a subdivided cube and their UVs based on flower_type subdivisions.
+
+        Faces wrapping around x are unwrapped onto a grid across UV space, while each end cap
+        covers the full UV square. Every face corner has its own UV, in polygon_connects order.
+
+        Returns:
+        - polygon_counts (list): number of vertices in each face
+        - polygon_connects (list): vertex indices of each face, in order
+        - u_values (list): u coordinate of each face corner
+        - v_values (list): v coordinate of each face corner
+        """
+        subdiv_x, subdiv_y = self.flower_type['subdiv-x'], self.flower_type['subdiv-y']
+        row_length = subdiv_x + 1
+        num_rows = 2 * (subdiv_y + 1)
+
+        polygon_connects, u_values, v_values = [], [], []
+
+        # Faces wrapping around x-axis: front, top, back and bottom
+        for row in range(num_rows):
+            start, end = row * row_length, (row + 1) % num_rows * row_length
+            v_low, v_high = row / num_rows, (row + 1) / num_rows
+            for col in range(subdiv_x):
+                polygon_connects.extend([start + col, start + col + 1, end + col + 1, end + col])
+                u_low, u_high = col / subdiv_x, (col + 1) / subdiv_x
+                u_values.extend([u_low, u_high, u_high, u_low])
+                v_values.extend([v_low, v_low, v_high, v_high])
+
+        # Faces capping both ends along x
+        for row in range(subdiv_y):
+            front, back = row * row_length, (num_rows - 1 - row) * row_length
+            front_up, back_up = front + row_length, back - row_length
+            polygon_connects.extend([front + subdiv_x, back + subdiv_x, back_up + subdiv_x, front_up + subdiv_x])
+            polygon_connects.extend([back, front, front_up, back_up])
+            v_low, v_high = row / subdiv_y, (row + 1) / subdiv_y
+            u_values.extend([0.0, 1.0, 1.0, 0.0] * 2)
+            v_values.extend([v_low, v_low, v_high, v_high] * 2)
+
+        polygon_counts = [4] * (len(polygon_connects) // 4)
+
+        return polygon_counts, polygon_connects, u_values, v_values
+
+    def _move_vertices(self, points):
         """
-        Moves vertices of a shape to create petal curvature on specified side.
+        Moves vertices of a shape to create petal curvature on both left and right sides.
+
+        Every vertex falls in either the left or right range, so all positions are set.
 
         Parameters:
-        - petal (str): name of the petal object in Maya
-        - num_vertices (int): total number of vertices in the petal
+        - points (ndarray): array of shape (num_vertices, 3) filled in place with vertex positions
         """
-        print("Moving vertices for petal:", petal)
+        log.debug("Moving %d petal vertices", len(points))
         
         # Split vertices into left and right lists
-        left_vertices, right_vertices = self._get_vertex_ranges(num_vertices)
-        print("Left vertices:", list(left_vertices), "Right vertices:", list(right_vertices))
-
-        # Create petal curvature on left
-        for i, vertex in enumerate(left_vertices):
-            pos = Flower.PETAL_VERTEX_MOVES[i % len(Flower.PETAL_VERTEX_MOVES)]
-            cmds.move(pos[0], pos[1], pos[2], '{}.vtx[{}]'.format(petal, vertex))
-            print(f"Moved left vertex {vertex} to position:", pos)
-        
-        # Create petal curvature on right
-        for i, vertex in enumerate(right_vertices):
-            pos = Flower.PETAL_VERTEX_MOVES[i % len(Flower.PETAL_VERTEX_MOVES)]
-            cmds.move(pos[0], pos[1], -pos[2], '{}.vtx[{}]'.format(petal, vertex))
-            print(f"Moved right vertex {vertex} to position:", (pos[0], pos[1], -pos[2]))
+        left_vertices, right_vertices = self._get_vertex_ranges(len(points))
+
+        # Cycle through moves along each side, mirrored on right
+        move_table_l, move_table_r = np.asarray(Flower.PETAL_VERTEX_MOVES), np.asarray(Flower.PETAL_VERTEX_MOVES_R)
+        num_moves = len(move_table_l)
+        left_moves = move_table_l[np.arange(len(left_vertices)) % num_moves]
+        right_moves = move_table_r[np.arange(len(right_vertices)) % num_moves]
+
+        # Create petal curvature on both sides in a single pass
+        vertex_ids = np.concatenate([np.asarray(left_vertices), np.asarray(right_vertices)])
+        points[vertex_ids] = np.concatenate([left_moves, right_moves])
+        log.debug("Moved %d left and %d right vertices", len(left_vertices), len(right_vertices))
 
     def _get_vertex_ranges(self, vertex_count):
         """
@@ -177,37 +292,23 @@ class Flower:
         - vertex_count (int): total number of vertices
 
         Returns:
-        - left_vertices (list): list of vertex indices for left side
-        - right_vertices (list): list of vertex indices for right side
+        - left_vertices (range): range of vertex indices for left side
+        - right_vertices (range): range of vertex indices for right side
         """
-        print("Getting vertex ranges for vertex count:", vertex_count)
+        log.debug("Getting vertex ranges for vertex count: %d", vertex_count)
 
         left_vertices = range(0, vertex_count // 2) # (start, halfway point - 1)
         right_vertices = range(vertex_count // 2, vertex_count) # (halfway point, total - 1)
 
-        print("Left vertex range:", list(left_vertices), "Right vertex range:", list(right_vertices))
+        log.debug("Left vertex range: %s Right vertex range: %s", left_vertices, right_vertices)
         return left_vertices, right_vertices
 
-    def _transform_petal(self, petal, layer):
-        """
-        Transforms given petal by scaling and tilting it based on layer type.
-
-        Parameters:
-        - petal (str): name of petal object in Maya
-        - flower_type (dict): dictionary containing dimensions ('width', 'height', 'depth', 'subdiv-x', 'subdiv-y')
-        - layer (str): type of layer ('base', 'mid', 'inner')
-        """
-        print(f"Transforming petal {petal} for layer {layer}")
-        
-        cmds.scale(0.7, 0.5, 0.8, petal)
-        print("Scaled petal:", petal)
-        
     def _arrange_petals(self, petal, petal_count, layer):
         """
-        Arranges petals around the flower disk.
+        Arranges instances of a petal around the flower disk, scaled based on layer type.
 
         Parameters:
-        - petal (str): name of the petal object in Maya
+        - petal (str): name of the petal object in Maya to instance
         - petal_count (int): number of petals in the layer
         - flower_type (dict): dictionary containing dimensions
         - layer (str): type of layer ('base', 'mid', 'inner')
@@ -217,41 +318,76 @@ class Flower:
         """
         flower_petals = []
 
-        # Calculate angle increment to evenly distribute petals around disk
-        rotation_increment = 360.0 / petal_count
+        # Precompute transform matrices of all petals in layer, converted once to
+        # Python floats expected by OpenMaya
+        matrices = self._get_petal_matrices(petal_count, layer).tolist()
 
-        # Place petals around flower disk
-        for i in range(petal_count):
-            angle = i * rotation_increment
-            petal_instance = cmds.duplicate(petal)[0]
-            cmds.rotate(0, -angle, 0, petal_instance) # Lay petal flat
+        # Bind loop functions locally
+        instance = cmds.instance
+        get_dag_path = self._get_dag_path
+        MTransformationMatrix, MMatrix = om.MTransformationMatrix, om.MMatrix
 
-            # Transform petals with scale and tilt based on layer type
-            # self._transform_petal(petal_instance, layer)
+        # Reuse a single function set for whole layer
+        transform_fn = om.MFnTransform()
 
-            # Position petal at edge of flower disk
-            radius = self.flower_type['petal_edge']
-            x = radius * math.cos(math.radians(angle))
-            z = radius * math.sin(math.radians(angle))
-            y = 0 # Default
-            cmds.move(x, y, z, petal_instance)
-            print(f"Positioned petal instance at: ({x}, {y}, {z}) with rotation angle {angle}")
+        # Place petals around flower disk
+        for i in range(petal_count):
+            petal_instance = instance(petal)[0] # Share petal mesh across layer
 
-            # # Rotate petal to align with face of flower disk
-            # cmds.rotate(0, -angle, 0, petal_instance)
+            # Lay petal flat, scale, and position it at edge of flower disk in a single API call
+            transform_fn.setObject(get_dag_path(petal_instance))
+            transform_fn.setTransformation(MTransformationMatrix(MMatrix(matrices[i])))
 
             # Save petal
             flower_petals.append(petal_instance)
 
-        # Delete original petal used for duplication
-        cmds.delete(petal)
+        log.debug("Positioned %d %s petal instances", petal_count, layer)
+        return flower_petals
 
-        # Clear selection
-        cmds.select(clear=True)
-        print("Deleted original petal used for duplication.")
+    def _get_dag_path(self, node):
+        """
+        Gets the OpenMaya DAG path of a node.
 
-        return flower_petals
+        Parameters:
+        - node (str): name of the node in Maya
+
+        Returns:
+        - dag_path (MDagPath): DAG path of the node
+        """
+        return om.MSelectionList().add(node).getDagPath(0)
+
+    def _get_petal_matrices(self, petal_count, layer):
+        """
+        Computes transform matrices placing petals evenly around the flower disk.
+
+        Each matrix scales a petal based on layer type, rotates it about y to face away
+        from the disk, and moves it to the disk edge, using Maya's row-vector layout.
+
+        Parameters:
+        - petal_count (int): number of petals in the layer
+        - layer (str): type of layer ('base', 'mid', 'inner')
+
+        Returns:
+        - matrices (ndarray): array of shape (petal_count, 4, 4) with petal transform matrices
+        """
+        radius = self.flower_type['petal_edge']
+        scale_x, scale_y, scale_z = Flower.LAYER_SCALES[layer]
+
+        angles = np.arange(petal_count) * (2 * np.pi / petal_count)
+        cosines, sines = np.cos(angles), np.sin(angles)
+
+        matrices = np.zeros((petal_count, 4, 4), dtype=np.float64)
+        matrices[:, 0, 0] = scale_x * cosines
+        matrices[:, 0, 2] = scale_x * sines
+        matrices[:, 1, 1] = scale_y
+        matrices[:, 2, 0] = -scale_z * sines
+        matrices[:, 2, 2] = scale_z * cosines
+        matrices[:, 3, 0] = radius * cosines
+        matrices[:, 3, 2] = radius * sines
+        matrices[:, 3, 3] = 1
+
+        return matrices
 
 flower = Flower()
 flower_disk, all_petals = flower.create_flower()
-print("Created flower with disk:", flower_disk, "and petals:", all_petals)
+log.debug("Created flower with disk: %s and petals: %s", flower_disk, all_petals)